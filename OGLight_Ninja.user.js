@@ -17,7 +17,8 @@
 // @run-at          document-start
 // ==/UserScript==
 
-	const urlMatch = /browser\/html\/s(\d+)-(\w+)/.exec(window.location.href);
+	const _URL_RE = /browser\/html\/s(\d+)-(\w+)/;
+	const urlMatch = _URL_RE.exec(window.location.href);
 	if(!urlMatch) { console.error('[OGLight Ninja] Invalid URL - expected format: browser/html/sXXX-xx'); throw new Error('Invalid OGame Ninja URL format'); }
 	const universeNum = urlMatch[1];
 	const lang = urlMatch[2];
@@ -26,6 +27,16 @@
 	const HOST = window.location.host;
 	const PLAYER_ID = document.querySelector("meta[name=ogame-player-id]").content;
 	const localStoragePrefix = UNIVERSE + "-" + PLAYER_ID + "-";
+	const _OG_HEX = Array.from({ length: 256 }, (_, i) => (i + 0x100).toString(16).slice(1));
+	function _ogUUID()
+	{
+		const b = new Uint8Array(16), h = _OG_HEX;
+		if(typeof crypto !== 'undefined' && crypto.getRandomValues) crypto.getRandomValues(b);
+		else for(let i = 0; i < 16; i++) b[i] = Math.random() * 256 | 0;
+		b[6] = (b[6] & 0x0f) | 0x40;
+		b[8] = (b[8] & 0x3f) | 0x80;
+		return `${h[b[0]]}${h[b[1]]}${h[b[2]]}${h[b[3]]}-${h[b[4]]}${h[b[5]]}-${h[b[6]]}${h[b[7]]}-${h[b[8]]}${h[b[9]]}-${h[b[10]]}${h[b[11]]}${h[b[12]]}${h[b[13]]}${h[b[14]]}${h[b[15]]}`;
+	}
 
 'use strict';
 
@@ -446,10 +457,7 @@ class OGLight
             // generate a new id
             if(!this.id || !this.id[0])
             {
-                let uuid = ['xxxxxxxx-xxxx-4xxx-yxxx-xxxxxxxxxxxx'.replace(/[xy]/g, function(c) {
-    var r = Math.random() * 16 | 0, v = c == 'x' ? r : (r & 0x3 | 0x8);
-    return v.toString(16);
-}), 0];
+                let uuid = [_ogUUID(), 0];
                 GM_setValue('ogl_id', uuid);
                 this.id == uuid;
             }
@@ -837,7 +845,7 @@ class OGLight
                 {
                     if(item.retry < 2)
                     {
-                        item.uid = 'xxxxxxxx-xxxx-4xxx-yxxx-xxxxxxxxxxxx'.replace(/[xy]/g, function(c) { var r = Math.random() * 16 | 0, v = c == 'x' ? r : (r & 0x3 | 0x8); return v.toString(16); });
+                        item.uid = _ogUUID();
                         item.retry++;
                         self._fleet.miniFleetQueue.push(item);
                     }
@@ -6166,7 +6174,7 @@ class FleetManager extends Manager
             item.ships = shipCount;
             item.additionalParams = additionalParams;
             item.retry = 0;
-            item.uid = 'xxxxxxxx-xxxx-4xxx-yxxx-xxxxxxxxxxxx'.replace(/[xy]/g, function(c) { var r = Math.random() * 16 | 0, v = c == 'x' ? r : (r & 0x3 | 0x8); return v.toString(16); });
+            item.uid = _ogUUID();
             item.popup = popup || false;
 
             document.querySelectorAll(`[onclick*="sendShips(${order}, ${galaxy}, ${system}, ${planet}, ${planettype}"]:not([data-spy-coords])`).forEach(e =>
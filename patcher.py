@@ -1,403 +1,651 @@
-# -*- coding: utf-8 -*-
-#!/usr/bin/env python3
-"""
-OGLight Patcher - Adapts OGLight for OGame Ninja
-=================================================
-
-Version: 2.8
-Author: CellMaster
-License: MIT
-Source OGLight: https://greasyfork.org/scripts/514909-oglight
-
-Description:
-    This script downloads the official OGLight userscript and applies patches
-    to make it compatible with OGame Ninja environment. The patches handle
-    differences in URL structure, API endpoints, session management, and
-    localStorage isolation for multi-account support.
-
-Supported OGLight Version: 5.3.3
-
-Usage:
-    python patcher.py
-
-Output:
-    OGLight_Ninja.user.js - Ready to install in Tampermonkey/Greasemonkey
-
-Patches Applied (19 total):
-    1.  Script name changed to "OGLight Ninja"
-    2.  @match pattern updated for Ninja URL structure
-    3.  Auto-update URLs removed (prevents overwriting)
-    4.  Environment variables injected with error handling (UNIVERSE, PLAYER_ID, etc.)
-    5.  Team Key (PTRE) stored per universe (shared across accounts)
-    6.  Server ID extracted from meta tag
-    7.  Language extracted from URL
-    8.  crypto.randomUUID() polyfill for compatibility (3 occurrences)
-    9.  playerData.xml API URL fixed
-    10. serverData.xml API URL fixed
-    11. players.xml API URL fixed
-    12. Player highscore link fixed (uses PROTOCOL/HOST)
-    13. Message detail URL fixed (uses PROTOCOL/HOST)
-    14. Generic game URLs converted to Ninja format
-    15. Multi-session logic adapted (meta tag instead of cookies)
-    16. DBName uses UNIVERSE variable for proper isolation
-    17. French keyboard (AZERTY) detection fixed
-    18. Legacy DB migration adapted for Ninja
-    19. Remaining localStorage keys prefixed with UNIVERSE (multi-account isolation)
-
-CHANGELOG:
-----------
-v1.0 - Initial release with 14 patches
-v2.0 - Multi-session logic adapted for OGame Ninja
-v2.1 - Regex error handling added
-v2.2 - DBName uses UNIVERSE variable
-v2.3 - French keyboard detection fixed
-v2.4 - DB Migration fix added
-v2.5 - Team Key storage optimization
-       - Team Key (ogl-ptreTK) now stored per UNIVERSE instead of per PLAYER_ID
-       - Before: s261-en-118964-ogl-ptreTK (required config for each account)
-       - After:  s261-en-ogl-ptreTK (config once per universe, shared by all accounts)
-       - This matches the original OGLight behavior where all accounts in same
-         universe share the same Team Key automatically
-v2.6 - Code optimization and bug fixes
-       - Patch 4: Error handling now included directly (unified with old Patch 16)
-       - Patch 8: Now converts ALL crypto.randomUUID() calls (1 array + 2 item.uid)
-       - Patch 14: URLs now CONVERTED instead of REMOVED (fixes fetch/navigation)
-       - Total patches reduced from 19 to 18 (cleaner code)
-v2.7 - Full localStorage isolation for multi-account support
-       - Patch 12 & 13: Now use PROTOCOL/HOST variables (consistency fix)
-       - Patch 19: Added - Prefixes remaining localStorage keys with UNIVERSE
-         - ogl-redirect, ogl_minipics, ogl_menulayout, ogl_colorblind, ogl_sidepanelleft
-         - Prevents configuration conflicts in multi-account scenarios
-       - Total patches: 19
-v2.8 - Updated for OGLight 5.3.3
-       - SHA256 updated for new version
-       - Removed unnecessary replace() limits for future-proofing:
-         - Patch 5: Team Key now uses unlimited replace (was limited to 2+1)
-         - Patch 8b: item.uid now uses unlimited replace (was limited to 2)
-         - Patch 14: Game URLs now uses unlimited replace (was limited to 30)
-       - All patches verified compatible with 5.3.3 changes:
-         - ogl-redirect: 1 get + 4 set (was 1+1)
-         - ogl_menulayout: 1 get + 2 set (was 1+1)
-       - Patcher is now more robust against future OGLight updates
-"""
-
-import hashlib
-import sys
-import requests
-
-# Configuration
-WEBSTORE_URL = "https://update.greasyfork.org/scripts/514909/OGLight.user.js"
-EXPECTED_SHA256 = "371795e1a20f04040c00fc9568b92fe536960aa115a49d406f3ae60a6405b432"
-OUTPUT_FILE = "OGLight_Ninja.user.js"
-
-def download_file(url):
-    """Downloads the file from URL"""
-    print(f"[*] Downloading file from: {url}")
-    try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        print("[+] Download completed!")
-        return response.content
-    except requests.exceptions.RequestException as e:
-        print(f"[!] Error downloading file: {e}")
-        sys.exit(1)
-
-def validate_sha256(content, expected_sha):
-    """Validates the file's SHA256"""
-    actual_sha = hashlib.sha256(content).hexdigest()
-    print(f"[*] Expected SHA256: {expected_sha}")
-    print(f"[*] Current SHA256:  {actual_sha}")
-
-    if actual_sha != expected_sha:
-        print("[!] SHA256 mismatch! The file has been modified or there's a new version.")
-        print("[!] Update EXPECTED_SHA256 if the change is intentional.")
-        sys.exit(1)
-
-    print("[+] SHA256 validated successfully!")
-
-def apply_patches(content):
-    """Applies all patches to the content"""
-    print("\n[*] Applying patches...")
-
-    # Convert bytes to string
-    text = content.decode('utf-8')
-
-    # Patch 1: Rename script
-    text = text.replace(
-        '@name            OGLight',
-        "@name            OGLight Ninja (CellMaster's Patcher)",
-        1
-    )
-    print("  [+] Patch 1/19: Script name changed")
-
-    # Patch 2: Replace @match with universal pattern
-    text = text.replace(
-        '// @match           https://*.ogame.gameforge.com/game/*\n',
-        '// @match           *://*/bots/*/browser/html/*?page=*\n',
-        1
-    )
-    print("  [+] Patch 2/19: @match simplified to universal pattern")
-
-    # Patch 3: Remove auto-update URLs (prevents overwriting patched version)
-    text = text.replace(
-        '// @downloadURL https://update.greasyfork.org/scripts/514909/OGLight.user.js\n',
-        '',
-        1
-    )
-    text = text.replace(
-        '// @updateURL https://update.greasyfork.org/scripts/514909/OGLight.meta.js\n',
-        '',
-        1
-    )
-    print("  [+] Patch 3/19: Auto-update URLs removed")
-
-    # Patch 4: Inject environment variables with error handling
-    userscript_injection = r'''// ==/UserScript==
-
-	const urlMatch = /browser\/html\/s(\d+)-(\w+)/.exec(window.location.href);
-	if(!urlMatch) { console.error('[OGLight Ninja] Invalid URL - expected format: browser/html/sXXX-xx'); throw new Error('Invalid OGame Ninja URL format'); }
-	const universeNum = urlMatch[1];
-	const lang = urlMatch[2];
-	const UNIVERSE = "s" + universeNum + "-" + lang;
-	const PROTOCOL = window.location.protocol;
-	const HOST = window.location.host;
-	const PLAYER_ID = document.querySelector("meta[name=ogame-player-id]").content;
-	const localStoragePrefix = UNIVERSE + "-" + PLAYER_ID + "-";
-'''
-    text = text.replace('// ==/UserScript==', userscript_injection, 1)
-    print("  [+] Patch 4/19: Environment variables injected (with error handling)")
-
-    # Patch 5: Add UNIVERSE prefix to Team Key (shared per universe, not per player)
-    # This allows all accounts in the same universe to share the same Team Key
-    count_get = text.count("localStorage.getItem('ogl-ptreTK')")
-    count_set = text.count("localStorage.setItem('ogl-ptreTK',")
-    text = text.replace(
-        "localStorage.getItem('ogl-ptreTK')",
-        "localStorage.getItem(UNIVERSE+'-ogl-ptreTK')"
-    )
-    text = text.replace(
-        "localStorage.setItem('ogl-ptreTK',",
-        "localStorage.setItem(UNIVERSE+'-ogl-ptreTK',"
-    )
-    print(f"  [+] Patch 5/19: Team Key prefixed with UNIVERSE ({count_get} get + {count_set} set)")
-
-    # Patch 6: Replace Server ID retrieval
-    text = text.replace(
-        "this.server.id = window.location.host.replace(/\\D/g,'');",
-        "this.server.id=document.querySelector('head meta[name=\"ogame-universe\"]').getAttribute('content').replace(/\\D/g,'');",
-        1
-    )
-    print("  [+] Patch 6/19: Server ID via meta tag")
-
-    # Patch 7: Replace Lang retrieval
-    text = text.replace(
-        'this.account.lang = /oglocale=([a-z]+);/.exec(document.cookie)[1];',
-        'this.account.lang=lang;',
-        1
-    )
-    print("  [+] Patch 7/19: Lang via variable")
-
-    # Patch 8: Replace all crypto.randomUUID() occurrences
-    # 8a: Replace array initialization pattern (1 occurrence)
-    uuid_replacement = r'''let uuid = ['xxxxxxxx-xxxx-4xxx-yxxx-xxxxxxxxxxxx'.replace(/[xy]/g, function(c) {
-    var r = Math.random() * 16 | 0, v = c == 'x' ? r : (r & 0x3 | 0x8);
-    return v.toString(16);
-}), 0];'''
-    text = text.replace('let uuid = [crypto.randomUUID(), 0];', uuid_replacement, 1)
-
-    # 8b: Replace item.uid assignment pattern (no limit - catches all occurrences)
-    uid_polyfill = r"""'xxxxxxxx-xxxx-4xxx-yxxx-xxxxxxxxxxxx'.replace(/[xy]/g, function(c) { var r = Math.random() * 16 | 0, v = c == 'x' ? r : (r & 0x3 | 0x8); return v.toString(16); })"""
-    count_uid = text.count('item.uid = crypto.randomUUID();')
-    text = text.replace('item.uid = crypto.randomUUID();', f'item.uid = {uid_polyfill};')
-    print(f"  [+] Patch 8/19: crypto.randomUUID() replaced (1 array + {count_uid} item.uid)")
-
-    # Patch 9: Fix playerData.xml URL
-    text = text.replace(
-        'url:`https://${window.location.host}/api/playerData.xml?id=${player.uid}`,',
-        'url:`${PROTOCOL}//${HOST}/api/s${universeNum}/${lang}/playerData.xml?id=${player.uid}`,',
-        1
-    )
-    print("  [+] Patch 9/19: playerData.xml URL fixed")
-
-    # Patch 10: Fix serverData.xml URL
-    text = text.replace(
-        'url:`https://${window.location.host}/api/serverData.xml`,',
-        'url:`${PROTOCOL}//${HOST}/api/s${universeNum}/${lang}/serverData.xml`,',
-        1
-    )
-    print("  [+] Patch 10/19: serverData.xml URL fixed")
-
-    # Patch 11: Fix players.xml URL (API endpoint)
-    text = text.replace(
-        'return fetch(`https://${window.location.host}/api/players.xml`,',
-        'return fetch(`${PROTOCOL}//${HOST}/api/s${universeNum}/${lang}/players.xml`,',
-        1
-    )
-    print("  [+] Patch 11/19: players.xml URL fixed")
-
-    # Patch 12: Fix player link (using PROTOCOL/HOST for consistency)
-    text = text.replace(
-        '${player.name} <a href="https://${window.location.host}/game/index.php?page=highscore',
-        '${player.name} <a href="${PROTOCOL}//${HOST}${window.location.pathname}?page=highscore',
-        1
-    )
-    print("  [+] Patch 12/19: Player link fixed")
-
-    # Patch 13: Fix message URL (using PROTOCOL/HOST for consistency)
-    text = text.replace(
-        'href:`https://${window.location.host}/game/index.php?page=componentOnly&component=messagedetails&messageId=${message.id}`',
-        'href:`${PROTOCOL}//${HOST}${window.location.pathname}?page=componentOnly&component=messagedetails&messageId=${message.id}`',
-        1
-    )
-    print("  [+] Patch 13/19: Message URL fixed")
-
-    # Patch 14: Convert game URLs to Ninja format (no limit - catches all occurrences)
-    count = text.count('https://${window.location.host}/game/index.php')
-    text = text.replace(
-        'https://${window.location.host}/game/index.php',
-        '${PROTOCOL}//${HOST}${window.location.pathname}'
-    )
-    print(f"  [+] Patch 14/19: Game URLs converted to Ninja format ({count} occurrences)")
-
-    # Patch 15: ADAPT multi-session logic for OGame Ninja (not remove - just adapt!)
-    # Extract old_block directly from text (no external file needed)
-    start_marker = '// get the account ID in cookies'
-    end_marker = "const accountID = cookieAccounts[cookieAccounts.length-1].replace(/\\D/g, '');"
-
-    start_idx = text.find(start_marker)
-    end_idx = text.find(end_marker, start_idx)
-
-    if start_idx == -1 or end_idx == -1:
-        print("  [!] Patch 15/19: FAILED - Could not find multi-session block!")
-        sys.exit(1)
-
-    old_block = text[start_idx:end_idx + len(end_marker)]
-
-    # ADAPTED VERSION: Use meta tag instead of cookies, but keep validation logic
-    new_block = '''// get the account ID from meta tag (OGame Ninja adaptation)
-        const accountMeta = document.querySelector('head meta[name="ogame-player-id"]');
-
-        // validate session exists (adapted for OGame Ninja)
-        if(!accountMeta || !accountMeta.content)
-        {
-            console.error('[OGLight Ninja] No player ID found in meta tag - session may be invalid');
-            alert('Session error: Unable to retrieve player ID. Please refresh the page.');
-            return;
-        }
-
-        const accountID = accountMeta.getAttribute('content').replace(/\\D/g, '');
-
-        // additional validation
-        if(!accountID || accountID === '0')
-        {
-            console.error('[OGLight Ninja] Invalid player ID:', accountID);
-            alert('Session error: Invalid player ID detected. Please refresh the page.');
-            return;
-        }'''
-
-    if old_block in text:
-        text = text.replace(old_block, new_block, 1)
-        print("  [+] Patch 15/19: Multi-session logic ADAPTED for OGame Ninja (keeps validation)")
-    else:
-        print("  [!] Patch 15/19: FAILED - Old text not found!")
-        sys.exit(1)
-
-    # Patch 16: Fix DBName to use UNIVERSE variable instead of window.location.host
-    text = text.replace(
-        "this.DBName = `${accountID}-${window.location.host.split('.')[0]}`;",
-        "this.DBName = `${accountID}-${UNIVERSE}`;",
-        1
-    )
-    print("  [+] Patch 16/19: DBName uses UNIVERSE variable")
-
-    # Patch 17: Fix French keyboard detection (AZERTY layout)
-    text = text.replace(
-        "galaxyUp: window.location.host.split(/[-.]/)[1] == 'fr' ? 'z' : 'w',",
-        "galaxyUp: lang == 'fr' ? 'z' : 'w',",
-        1
-    )
-    text = text.replace(
-        "galaxyLeft: window.location.host.split(/[-.]/)[1] == 'fr' ? 'q' : 'a',",
-        "galaxyLeft: lang == 'fr' ? 'q' : 'a',",
-        1
-    )
-    print("  [+] Patch 17/19: French keyboard detection fixed")
-
-    # Patch 18: Fix legacy DB migration for OGame Ninja
-    # Uses meta tag ogame-universe instead of window.location.host
-    text = text.replace(
-        '''        // fix beta old DB
-        if(!GM_getValue(this.DBName) && GM_getValue(window.location.host))
-        {
-            GM_setValue(this.DBName, GM_getValue(window.location.host));
-            GM_deleteValue(window.location.host);
-            window.location.reload();
-        }''',
-        '''        // fix beta old DB - ADAPTED for OGame Ninja
-        const oldHost = document.querySelector('meta[name="ogame-universe"]').getAttribute('content');
-        if(!GM_getValue(this.DBName) && GM_getValue(oldHost))
-        {
-            GM_setValue(this.DBName, GM_getValue(oldHost));
-            GM_deleteValue(oldHost);
-            window.location.reload();
-        }''',
-        1
-    )
-    print("  [+] Patch 18/19: Legacy DB migration fixed for Ninja")
-
-    # Patch 19: Prefix remaining localStorage keys with UNIVERSE
-    # These keys were global and caused conflicts in multi-account scenarios
-    localStorage_keys = ['ogl-redirect', 'ogl_minipics', 'ogl_menulayout', 'ogl_colorblind', 'ogl_sidepanelleft']
-    total_replacements = 0
-    for key in localStorage_keys:
-        count_get = text.count(f"localStorage.getItem('{key}')")
-        count_set = text.count(f"localStorage.setItem('{key}',")
-        text = text.replace(f"localStorage.getItem('{key}')", f"localStorage.getItem(UNIVERSE+'-{key}')")
-        text = text.replace(f"localStorage.setItem('{key}',", f"localStorage.setItem(UNIVERSE+'-{key}',")
-        total_replacements += count_get + count_set
-        if count_get + count_set > 0:
-            print(f"    - {key}: {count_get} get + {count_set} set")
-    print(f"  [+] Patch 19/19: Remaining localStorage keys prefixed ({total_replacements} occurrences)")
-
-    print("[+] All 19 patches applied successfully!\n")
-
-    return text.encode('utf-8')
-
-def save_file(content, filename):
-    """Saves the patched file"""
-    print(f"[*] Saving file: {filename}")
-    try:
-        with open(filename, 'wb') as f:
-            f.write(content)
-        print(f"[+] File saved successfully!")
-    except Exception as e:
-        print(f"[!] Error saving file: {e}")
-        sys.exit(1)
-
-def main():
-    print("=" * 60)
-    print("OGLight Patcher - OGame Ninja Edition v2.8")
-    print("Supported OGLight version: 5.3.3 (19 patches)")
-    print("=" * 60)
-    print()
-
-    # 1. Download file
-    content = download_file(WEBSTORE_URL)
-
-    # 2. Validate SHA256
-    validate_sha256(content, EXPECTED_SHA256)
-
-    # 3. Apply patches
-    patched_content = apply_patches(content)
-
-    # 4. Save file
-    save_file(patched_content, OUTPUT_FILE)
-
-    print()
-    print("=" * 60)
-    print("Process completed successfully!")
-    print(f"Generated file: {OUTPUT_FILE}")
-    print("=" * 60)
-
-if __name__ == "__main__":
-    main()
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python3
+"""
+OGLight Patcher - Adapts OGLight for OGame Ninja
+=================================================
+
+Version: 2.9
+Author: CellMaster
+License: MIT
+Source OGLight: https://greasyfork.org/scripts/514909-oglight
+
+Description:
+    This script downloads the official OGLight userscript and applies patches
+    to make it compatible with OGame Ninja environment. The patches handle
+    differences in URL structure, API endpoints, session management, and
+    localStorage isolation for multi-account support.
+
+Supported OGLight Version: 5.3.3
+
+Requirements:
+    pip install requests ahocorasick_rs
+
+Usage:
+    python patcher.py
+    python patcher.py --input OGLight.user.js   (offline: patch a local copy)
+    python patcher.py --input OGLight.user.js --no-verify   (skip SHA256 check)
+
+Output:
+    OGLight_Ninja.user.js - Ready to install in Tampermonkey/Greasemonkey
+
+Patches Applied (19 total):
+    1.  Script name changed to "OGLight Ninja"
+    2.  @match pattern updated for Ninja URL structure
+    3.  Auto-update URLs removed (prevents overwriting)
+    4.  Environment variables injected with error handling (UNIVERSE, PLAYER_ID, etc.)
+    5.  Team Key (PTRE) stored per universe (shared across accounts)
+    6.  Server ID extracted from meta tag
+    7.  Language extracted from URL
+    8.  crypto.randomUUID() polyfill for compatibility (3 occurrences)
+    9.  playerData.xml API URL fixed
+    10. serverData.xml API URL fixed
+    11. players.xml API URL fixed
+    12. Player highscore link fixed (uses PROTOCOL/HOST)
+    13. Message detail URL fixed (uses PROTOCOL/HOST)
+    14. Generic game URLs converted to Ninja format
+    15. Multi-session logic adapted (meta tag instead of cookies)
+    16. DBName uses UNIVERSE variable for proper isolation
+    17. French keyboard (AZERTY) detection fixed
+    18. Legacy DB migration adapted for Ninja
+    19. Remaining localStorage keys prefixed with UNIVERSE (multi-account isolation)
+
+CHANGELOG:
+----------
+v1.0 - Initial release with 14 patches
+v2.0 - Multi-session logic adapted for OGame Ninja
+v2.1 - Regex error handling added
+v2.2 - DBName uses UNIVERSE variable
+v2.3 - French keyboard detection fixed
+v2.4 - DB Migration fix added
+v2.5 - Team Key storage optimization
+       - Team Key (ogl-ptreTK) now stored per UNIVERSE instead of per PLAYER_ID
+       - Before: s261-en-118964-ogl-ptreTK (required config for each account)
+       - After:  s261-en-ogl-ptreTK (config once per universe, shared by all accounts)
+       - This matches the original OGLight behavior where all accounts in same
+         universe share the same Team Key automatically
+v2.6 - Code optimization and bug fixes
+       - Patch 4: Error handling now included directly (unified with old Patch 16)
+       - Patch 8: Now converts ALL crypto.randomUUID() calls (1 array + 2 item.uid)
+       - Patch 14: URLs now CONVERTED instead of REMOVED (fixes fetch/navigation)
+       - Total patches reduced from 19 to 18 (cleaner code)
+v2.7 - Full localStorage isolation for multi-account support
+       - Patch 12 & 13: Now use PROTOCOL/HOST variables (consistency fix)
+       - Patch 19: Added - Prefixes remaining localStorage keys with UNIVERSE
+         - ogl-redirect, ogl_minipics, ogl_menulayout, ogl_colorblind, ogl_sidepanelleft
+         - Prevents configuration conflicts in multi-account scenarios
+       - Total patches: 19
+v2.8 - Updated for OGLight 5.3.3
+       - SHA256 updated for new version
+       - Removed unnecessary replace() limits for future-proofing:
+         - Patch 5: Team Key now uses unlimited replace (was limited to 2+1)
+         - Patch 8b: item.uid now uses unlimited replace (was limited to 2)
+         - Patch 14: Game URLs now uses unlimited replace (was limited to 30)
+       - All patches verified compatible with 5.3.3 changes:
+         - ogl-redirect: 1 get + 4 set (was 1+1)
+         - ogl_menulayout: 1 get + 2 set (was 1+1)
+       - Patcher is now more robust against future OGLight updates
+v2.9 - Performance rework
+       - Literal patches applied in a single Aho-Corasick pass (ahocorasick_rs)
+         instead of ~30 sequential str.replace() calls over the whole script
+       - Replacement counts collected during the same pass (no text.count())
+       - Patch 15 block located by the same single scan (start/end markers)
+       - SHA256 computed incrementally while the download streams in
+       - Conditional GET (ETag / If-Modified-Since): unchanged upstream file is
+         reused from ~/.cache/oglight-patcher instead of downloaded again
+       - Patches work on the raw bytes (no decode/encode of the whole script)
+       - Patch 4: URL regex declared once as a constant (_URL_RE)
+       - Patch 8: UUID polyfill is a single injected _ogUUID() helper filling
+         16 bytes from crypto.getRandomValues (regex/Math.random-per-char gone)
+       - Patch 8: _ogUUID() formats bytes through a precomputed hex table
+       - Patches declared in one PATCHES table
+       - Output and cache files written atomically (temp file + os.replace)
+       - Patch spans checked for ordering and overlap before splicing
+       - Output assembled from memoryview slices in a single join
+       - Every patch target verified during the scan, before anything is
+         replaced: upstream drift now fails instead of silently skipping patches
+       - Injected JavaScript blocks are module-level constants
+       - --input/--offline PATH patches a local copy without any network access;
+         --no-verify skips the SHA256 check
+       - Patch 5 built from the same getItem/setItem templates as Patch 19,
+         all log counts read from the scan's Counter
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from collections import Counter, namedtuple
+
+import ahocorasick_rs
+import requests
+
+# Configuration
+WEBSTORE_URL = "https://update.greasyfork.org/scripts/514909/OGLight.user.js"
+EXPECTED_SHA256 = "371795e1a20f04040c00fc9568b92fe536960aa115a49d406f3ae60a6405b432"
+OUTPUT_FILE = "OGLight_Ninja.user.js"
+# Streaming download chunk size: ~100 KiB is where per-chunk overhead stops
+# mattering and the download becomes network-bound; past 1 MiB returns diminish
+DOWNLOAD_CHUNK_SIZE = 128 * 1024
+# Last download + its ETag/Last-Modified, reused when greasyfork answers 304
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "oglight-patcher")
+CACHE_META_FILE = os.path.join(CACHE_DIR, "meta.json")
+CACHE_BODY_FILE = os.path.join(CACHE_DIR, "OGLight.user.js")
+
+# Patch 19: localStorage keys that were global and caused conflicts in
+# multi-account scenarios; each one gets prefixed with UNIVERSE
+LOCALSTORAGE_KEYS = [b'ogl-redirect', b'ogl_minipics', b'ogl_menulayout', b'ogl_colorblind', b'ogl_sidepanelleft']
+
+# Patch 5: Team Key (PTRE) localStorage key, shared per universe
+TEAM_KEY = b'ogl-ptreTK'
+
+# Patches 5 and 19 rewrite both localStorage calls of a key from these
+# (op, before, after) templates, which the per-key log counts reuse
+LOCALSTORAGE_CALLS = (
+    ('get', b"localStorage.getItem('%s')", b"localStorage.getItem(UNIVERSE+'-%s')"),
+    ('set', b"localStorage.setItem('%s',", b"localStorage.setItem(UNIVERSE+'-%s',"),
+)
+
+# Patch 15: the multi-session block spans from its comment to the accountID
+# assignment; both markers are found by the same scan as the literal patches
+MULTISESSION_BLOCK_MARKERS = (
+    b'// get the account ID in cookies',
+    b"const accountID = cookieAccounts[cookieAccounts.length-1].replace(/\\D/g, '');",
+)
+
+# Patch 8: UUID v4 helper replacing crypto.randomUUID() (not available in every
+# context). Fills 16 bytes with one crypto.getRandomValues() call (Math.random
+# fallback) and formats them through a precomputed byte-to-hex table
+UUID_POLYFILL = rb'''	const _OG_HEX = Array.from({ length: 256 }, (_, i) => (i + 0x100).toString(16).slice(1));
+	function _ogUUID()
+	{
+		const b = new Uint8Array(16), h = _OG_HEX;
+		if(typeof crypto !== 'undefined' && crypto.getRandomValues) crypto.getRandomValues(b);
+		else for(let i = 0; i < 16; i++) b[i] = Math.random() * 256 | 0;
+		b[6] = (b[6] & 0x0f) | 0x40;
+		b[8] = (b[8] & 0x3f) | 0x80;
+		return `${h[b[0]]}${h[b[1]]}${h[b[2]]}${h[b[3]]}-${h[b[4]]}${h[b[5]]}-${h[b[6]]}${h[b[7]]}-${h[b[8]]}${h[b[9]]}-${h[b[10]]}${h[b[11]]}${h[b[12]]}${h[b[13]]}${h[b[14]]}${h[b[15]]}`;
+	}
+'''
+
+# Patch 4: environment variables injected right after the userscript header,
+# with error handling on the URL format, followed by the Patch 8 UUID helper
+USERSCRIPT_INJECTION = rb'''// ==/UserScript==
+
+	const _URL_RE = /browser\/html\/s(\d+)-(\w+)/;
+	const urlMatch = _URL_RE.exec(window.location.href);
+	if(!urlMatch) { console.error('[OGLight Ninja] Invalid URL - expected format: browser/html/sXXX-xx'); throw new Error('Invalid OGame Ninja URL format'); }
+	const universeNum = urlMatch[1];
+	const lang = urlMatch[2];
+	const UNIVERSE = "s" + universeNum + "-" + lang;
+	const PROTOCOL = window.location.protocol;
+	const HOST = window.location.host;
+	const PLAYER_ID = document.querySelector("meta[name=ogame-player-id]").content;
+	const localStoragePrefix = UNIVERSE + "-" + PLAYER_ID + "-";
+''' + UUID_POLYFILL
+
+# Patch 15 ADAPTED VERSION: Use meta tag instead of cookies, but keep validation logic
+NEW_MULTISESSION_BLOCK = b'''// get the account ID from meta tag (OGame Ninja adaptation)
+        const accountMeta = document.querySelector('head meta[name="ogame-player-id"]');
+
+        // validate session exists (adapted for OGame Ninja)
+        if(!accountMeta || !accountMeta.content)
+        {
+            console.error('[OGLight Ninja] No player ID found in meta tag - session may be invalid');
+            alert('Session error: Unable to retrieve player ID. Please refresh the page.');
+            return;
+        }
+
+        const accountID = accountMeta.getAttribute('content').replace(/\\D/g, '');
+
+        // additional validation
+        if(!accountID || accountID === '0')
+        {
+            console.error('[OGLight Ninja] Invalid player ID:', accountID);
+            alert('Session error: Invalid player ID detected. Please refresh the page.');
+            return;
+        }'''
+
+# A patch replaces `before` with `after`, at most `limit` times (0 = all).
+# `before` is either a literal or, for blocks that must be extracted at
+# runtime, a (start_marker, end_marker) pair delimiting the block. Every
+# before/after is pure ASCII, so they are matched directly on the raw UTF-8
+# bytes of the script without decoding it.
+Patch = namedtuple('Patch', ['name', 'before', 'after', 'limit'])
+
+# All patches, in log order. apply_patches() locates them all in a single
+# pass where the longest target at a position wins; a target already used up
+# to its limit is left alone, and the shorter targets inside it still apply.
+PATCHES = (
+    # Patch 1: Rename script
+    Patch('Patch 1/19', b'@name            OGLight', b"@name            OGLight Ninja (CellMaster's Patcher)", 1),
+
+    # Patch 2: Replace @match with universal pattern
+    Patch('Patch 2/19', b'// @match           https://*.ogame.gameforge.com/game/*\n', b'// @match           *://*/bots/*/browser/html/*?page=*\n', 1),
+
+    # Patch 3: Remove auto-update URLs (prevents overwriting patched version)
+    Patch('Patch 3/19', b'// @downloadURL https://update.greasyfork.org/scripts/514909/OGLight.user.js\n', b'', 1),
+    Patch('Patch 3/19', b'// @updateURL https://update.greasyfork.org/scripts/514909/OGLight.meta.js\n', b'', 1),
+
+    # Patch 4: Inject environment variables with error handling
+    Patch('Patch 4/19', b'// ==/UserScript==', USERSCRIPT_INJECTION, 1),
+
+    # Patch 5: Add UNIVERSE prefix to Team Key (shared per universe, not per player)
+    # This allows all accounts in the same universe to share the same Team Key
+    *(Patch('Patch 5/19', before % TEAM_KEY, after % TEAM_KEY, 0) for _, before, after in LOCALSTORAGE_CALLS),
+
+    # Patch 6: Replace Server ID retrieval
+    Patch('Patch 6/19', b"this.server.id = window.location.host.replace(/\\D/g,'');",
+          b"this.server.id=document.querySelector('head meta[name=\"ogame-universe\"]').getAttribute('content').replace(/\\D/g,'');", 1),
+
+    # Patch 7: Replace Lang retrieval
+    Patch('Patch 7/19', b'this.account.lang = /oglocale=([a-z]+);/.exec(document.cookie)[1];', b'this.account.lang=lang;', 1),
+
+    # Patch 8: Replace all crypto.randomUUID() occurrences with the _ogUUID()
+    # helper injected by Patch 4 (crypto.getRandomValues, Math.random fallback)
+    # 8a: Replace array initialization pattern (1 occurrence)
+    Patch('Patch 8/19', b'let uuid = [crypto.randomUUID(), 0];', b'let uuid = [_ogUUID(), 0];', 1),
+    # 8b: Replace item.uid assignment pattern (no limit - catches all occurrences)
+    Patch('Patch 8/19', b'item.uid = crypto.randomUUID();', b'item.uid = _ogUUID();', 0),
+
+    # Patch 9: Fix playerData.xml URL
+    Patch('Patch 9/19', b'url:`https://${window.location.host}/api/playerData.xml?id=${player.uid}`,',
+          b'url:`${PROTOCOL}//${HOST}/api/s${universeNum}/${lang}/playerData.xml?id=${player.uid}`,', 1),
+
+    # Patch 10: Fix serverData.xml URL
+    Patch('Patch 10/19', b'url:`https://${window.location.host}/api/serverData.xml`,',
+          b'url:`${PROTOCOL}//${HOST}/api/s${universeNum}/${lang}/serverData.xml`,', 1),
+
+    # Patch 11: Fix players.xml URL (API endpoint)
+    Patch('Patch 11/19', b'return fetch(`https://${window.location.host}/api/players.xml`,',
+          b'return fetch(`${PROTOCOL}//${HOST}/api/s${universeNum}/${lang}/players.xml`,', 1),
+
+    # Patch 12: Fix player link (using PROTOCOL/HOST for consistency)
+    Patch('Patch 12/19', b'${player.name} <a href="https://${window.location.host}/game/index.php?page=highscore',
+          b'${player.name} <a href="${PROTOCOL}//${HOST}${window.location.pathname}?page=highscore', 1),
+
+    # Patch 13: Fix message URL (using PROTOCOL/HOST for consistency)
+    Patch('Patch 13/19', b'href:`https://${window.location.host}/game/index.php?page=componentOnly&component=messagedetails&messageId=${message.id}`',
+          b'href:`${PROTOCOL}//${HOST}${window.location.pathname}?page=componentOnly&component=messagedetails&messageId=${message.id}`', 1),
+
+    # Patch 14: Convert game URLs to Ninja format (no limit - catches all occurrences)
+    # Patches 12 and 13 contain this URL too; their longer match wins in the scan
+    Patch('Patch 14/19', b'https://${window.location.host}/game/index.php', b'${PROTOCOL}//${HOST}${window.location.pathname}', 0),
+
+    # Patch 15: ADAPT multi-session logic for OGame Ninja (not remove - just adapt!)
+    # The old block is located at runtime by MULTISESSION_BLOCK_MARKERS
+    Patch('Patch 15/19', MULTISESSION_BLOCK_MARKERS, NEW_MULTISESSION_BLOCK, 1),
+
+    # Patch 16: Fix DBName to use UNIVERSE variable instead of window.location.host
+    Patch('Patch 16/19', b"this.DBName = `${accountID}-${window.location.host.split('.')[0]}`;", b"this.DBName = `${accountID}-${UNIVERSE}`;", 1),
+
+    # Patch 17: Fix French keyboard detection (AZERTY layout)
+    Patch('Patch 17/19', b"galaxyUp: window.location.host.split(/[-.]/)[1] == 'fr' ? 'z' : 'w',", b"galaxyUp: lang == 'fr' ? 'z' : 'w',", 1),
+    Patch('Patch 17/19', b"galaxyLeft: window.location.host.split(/[-.]/)[1] == 'fr' ? 'q' : 'a',", b"galaxyLeft: lang == 'fr' ? 'q' : 'a',", 1),
+
+    # Patch 18: Fix legacy DB migration for OGame Ninja
+    # Uses meta tag ogame-universe instead of window.location.host
+    Patch('Patch 18/19', b'''        // fix beta old DB
+        if(!GM_getValue(this.DBName) && GM_getValue(window.location.host))
+        {
+            GM_setValue(this.DBName, GM_getValue(window.location.host));
+            GM_deleteValue(window.location.host);
+            window.location.reload();
+        }''',
+          b'''        // fix beta old DB - ADAPTED for OGame Ninja
+        const oldHost = document.querySelector('meta[name="ogame-universe"]').getAttribute('content');
+        if(!GM_getValue(this.DBName) && GM_getValue(oldHost))
+        {
+            GM_setValue(this.DBName, GM_getValue(oldHost));
+            GM_deleteValue(oldHost);
+            window.location.reload();
+        }''', 1),
+)
+
+# Patch 19: Prefix remaining localStorage keys with UNIVERSE
+PATCHES += tuple(
+    Patch('Patch 19/19', before % key, after % key, 0)
+    for key in LOCALSTORAGE_KEYS
+    for _, before, after in LOCALSTORAGE_CALLS
+)
+
+LITERAL_PATCH_INDEXES = [i for i, patch in enumerate(PATCHES) if isinstance(patch.before, bytes)]
+BLOCK_PATCH_INDEXES = [i for i, patch in enumerate(PATCHES) if not isinstance(patch.before, bytes)]
+
+# Automaton needles: the literal patches first, then the start and end
+# markers of each block patch in pairs. Leftmost-longest matching lets the
+# specific URL patches (12, 13) take precedence over the generic game URL
+# conversion (14)
+PATCH_AUTOMATON = ahocorasick_rs.BytesAhoCorasick(
+    [PATCHES[i].before for i in LITERAL_PATCH_INDEXES]
+    + [marker for i in BLOCK_PATCH_INDEXES for marker in PATCHES[i].before],
+    matchkind=ahocorasick_rs.MatchKind.LeftmostLongest,
+)
+
+def write_file_atomic(filename, content):
+    """Writes content to a temp file and renames it over filename
+
+    A crash mid-write can never leave a truncated file behind.
+    """
+    tmp_filename = filename + '.tmp'
+    fd = os.open(tmp_filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        view = memoryview(content)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    except BaseException:
+        os.close(fd)
+        os.remove(tmp_filename)
+        raise
+    os.close(fd)
+    os.replace(tmp_filename, filename)
+
+def load_cache_meta(url):
+    """Loads the cached download metadata for URL (empty if there is none)"""
+    try:
+        with open(CACHE_META_FILE, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(meta, dict) or meta.get('url') != url:
+        return {}
+    if not isinstance(meta.get('path'), str) or not os.path.isfile(meta['path']):
+        return {}
+    return meta
+
+def save_cache(url, content, headers):
+    """Caches the downloaded file with its ETag/Last-Modified headers"""
+    meta = {
+        'url': url,
+        'etag': headers.get('ETag'),
+        'last_modified': headers.get('Last-Modified'),
+        'path': CACHE_BODY_FILE,
+    }
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        write_file_atomic(CACHE_BODY_FILE, content)
+        write_file_atomic(CACHE_META_FILE, json.dumps(meta).encode('utf-8'))
+    except OSError as e:
+        # The cache only saves bandwidth on the next run, never fail on it
+        print(f"[!] Could not update download cache: {e}")
+
+def download_file(url, use_cache=True):
+    """Downloads the file from URL, hashing it while it streams in
+
+    Sends a conditional GET when a cached copy exists and reuses it on
+    HTTP 304. Returns a (content, sha256_hexdigest) tuple.
+    """
+    if use_cache:
+        print(f"[*] Downloading file from: {url}")
+    meta = load_cache_meta(url) if use_cache else {}
+    headers = {}
+    if meta.get('etag'):
+        headers['If-None-Match'] = meta['etag']
+    if meta.get('last_modified'):
+        headers['If-Modified-Since'] = meta['last_modified']
+    try:
+        with requests.get(url, headers=headers, stream=True, timeout=30) as response:
+            response.raise_for_status()
+            if response.status_code == 304:
+                try:
+                    with open(meta['path'], 'rb') as f:
+                        content = f.read()
+                except OSError as e:
+                    print(f"[!] Cached copy unreadable ({e}), downloading it again...")
+                    return download_file(url, use_cache=False)
+                print("[+] Not modified since last download, using cached copy!")
+                return content, hashlib.sha256(content).hexdigest()
+            sha = hashlib.sha256()
+            content = bytearray()
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                sha.update(chunk)
+                content.extend(chunk)
+            content = bytes(content)
+            save_cache(url, content, response.headers)
+        print("[+] Download completed!")
+        return content, sha.hexdigest()
+    except requests.exceptions.RequestException as e:
+        print(f"[!] Error downloading file: {e}")
+        sys.exit(1)
+
+def read_file(filename):
+    """Reads a local copy of the userscript
+
+    Returns a (content, sha256_hexdigest) tuple, like download_file().
+    """
+    print(f"[*] Reading file: {filename}")
+    try:
+        with open(filename, 'rb') as f:
+            content = f.read()
+    except OSError as e:
+        print(f"[!] Error reading file: {e}")
+        sys.exit(1)
+    print("[+] File read!")
+    return content, hashlib.sha256(content).hexdigest()
+
+def validate_sha256(actual_sha, expected_sha):
+    """Validates the file's SHA256 (computed during the download)"""
+    print(f"[*] Expected SHA256: {expected_sha}")
+    print(f"[*] Current SHA256:  {actual_sha}")
+
+    if actual_sha != expected_sha:
+        print("[!] SHA256 mismatch! The file has been modified or there's a new version.")
+        print("[!] Update EXPECTED_SHA256 if the change is intentional.")
+        sys.exit(1)
+
+    print("[+] SHA256 validated successfully!")
+
+def missing_patches(schedule):
+    """Returns the indexes of the patches a schedule does not apply"""
+    found = {idx for _, _, idx in schedule}
+    return [idx for idx in range(len(PATCHES)) if idx not in found]
+
+def is_valid_schedule(schedule):
+    """Checks that a schedule is offset-ordered and non-overlapping"""
+    pos = 0
+    for start, end, _ in schedule:
+        if not pos <= start <= end:
+            return False
+        pos = end
+    return True
+
+def scan_literals(text, start, exhausted):
+    """Rescans text from start for the literal targets not in exhausted
+
+    Returns (start, end, patch_index) matches, in offset order.
+    """
+    indexes = [idx for idx in LITERAL_PATCH_INDEXES if idx not in exhausted]
+    automaton = ahocorasick_rs.BytesAhoCorasick(
+        [PATCHES[idx].before for idx in indexes],
+        matchkind=ahocorasick_rs.MatchKind.LeftmostLongest,
+    )
+    return [
+        (start + match_start, start + match_end, indexes[needle])
+        for needle, match_start, match_end in automaton.find_matches_as_indexes(memoryview(text)[start:])
+    ]
+
+def find_patch_schedule(text):
+    """Finds where every patch applies in a single pass over the text
+
+    Returns the (start, end, patch_index) spans to replace, in offset order.
+    """
+    literal_count = len(LITERAL_PATCH_INDEXES)
+    literals = []
+    block_starts = {}
+    blocks = {}
+    for needle, start, end in PATCH_AUTOMATON.find_matches_as_indexes(text):
+        if needle < literal_count:
+            literals.append((start, end, LITERAL_PATCH_INDEXES[needle]))
+            continue
+        # A block spans from the first start marker to the first end marker after it
+        idx = BLOCK_PATCH_INDEXES[(needle - literal_count) // 2]
+        if (needle - literal_count) % 2 == 0:
+            block_starts.setdefault(idx, start)
+        elif idx in block_starts and idx not in blocks:
+            blocks[idx] = (block_starts[idx], end, idx)
+    schedule = list(blocks.values())
+
+    applied = Counter()
+    exhausted = set()
+    i = 0
+    while i < len(literals):
+        start, end, idx = literals[i]
+        i += 1
+        # Literals inside a replaced block go away with the block
+        if any(block_start < end and start < block_end for block_start, block_end, _ in blocks.values()):
+            continue
+        if idx in exhausted:
+            # Over its limit, this match stays as is, but it hid any shorter
+            # target inside it (e.g. Patch 14's URL in a second Patch 12
+            # link): search the rest again without the used-up targets
+            literals = scan_literals(text, start, exhausted)
+            i = 0
+            continue
+        applied[idx] += 1
+        if applied[idx] == PATCHES[idx].limit:
+            exhausted.add(idx)
+        schedule.append((start, end, idx))
+
+    # Fail fast on upstream drift: every patch must have found its target
+    # before anything is replaced, instead of silently applying a subset
+    missing = missing_patches(schedule)
+    for idx in missing:
+        before = PATCHES[idx].before
+        if isinstance(before, bytes):
+            target = before.decode('ascii').strip().splitlines()[0]
+            print(f"  [!] {PATCHES[idx].name}: FAILED - Text not found: {target}")
+        else:
+            print(f"  [!] {PATCHES[idx].name}: FAILED - Could not find the block to replace!")
+    if missing:
+        print("[!] OGLight no longer matches the patches, they need to be updated.")
+        sys.exit(1)
+
+    schedule.sort()
+    if not is_valid_schedule(schedule):
+        print("[!] Patch targets overlap, the patches need to be updated.")
+        sys.exit(1)
+    return schedule
+
+def count_key_calls(counts, key):
+    """Counts the prefixed getItem/setItem calls of a localStorage key
+
+    Returns the total and its "N get + M set" breakdown for the log.
+    """
+    key_counts = [(op, counts[before % key]) for op, before, _ in LOCALSTORAGE_CALLS]
+    total = sum(count for _, count in key_counts)
+    return total, ' + '.join(f"{count} {op}" for op, count in key_counts)
+
+def apply_patches(content):
+    """Applies all patches to the content"""
+    print("\n[*] Applying patches...")
+
+    schedule = find_patch_schedule(content)
+
+    # Unchanged parts are memoryview slices (no copy) joined with the
+    # replacements in one preallocated write
+    view = memoryview(content)
+    pieces = []
+    pos = 0
+    for start, end, idx in schedule:
+        pieces.append(view[pos:start])
+        pieces.append(PATCHES[idx].after)
+        pos = end
+    pieces.append(view[pos:])
+    output = b''.join(pieces)
+    counts = Counter(PATCHES[idx].before for _, _, idx in schedule)
+
+    # Log lines are collected and written once at the end; the counts come
+    # straight from the schedule
+    _, team_key_calls = count_key_calls(counts, TEAM_KEY)
+    count_uid = counts[b'item.uid = crypto.randomUUID();']
+    count_urls = counts[b'https://${window.location.host}/game/index.php']
+    log = [
+        "  [+] Patch 1/19: Script name changed",
+        "  [+] Patch 2/19: @match simplified to universal pattern",
+        "  [+] Patch 3/19: Auto-update URLs removed",
+        "  [+] Patch 4/19: Environment variables injected (with error handling)",
+        f"  [+] Patch 5/19: Team Key prefixed with UNIVERSE ({team_key_calls})",
+        "  [+] Patch 6/19: Server ID via meta tag",
+        "  [+] Patch 7/19: Lang via variable",
+        f"  [+] Patch 8/19: crypto.randomUUID() replaced (1 array + {count_uid} item.uid)",
+        "  [+] Patch 9/19: playerData.xml URL fixed",
+        "  [+] Patch 10/19: serverData.xml URL fixed",
+        "  [+] Patch 11/19: players.xml URL fixed",
+        "  [+] Patch 12/19: Player link fixed",
+        "  [+] Patch 13/19: Message URL fixed",
+        f"  [+] Patch 14/19: Game URLs converted to Ninja format ({count_urls} occurrences)",
+        "  [+] Patch 15/19: Multi-session logic ADAPTED for OGame Ninja (keeps validation)",
+        "  [+] Patch 16/19: DBName uses UNIVERSE variable",
+        "  [+] Patch 17/19: French keyboard detection fixed",
+        "  [+] Patch 18/19: Legacy DB migration fixed for Ninja",
+    ]
+    total_replacements = 0
+    for key in LOCALSTORAGE_KEYS:
+        key_total, key_calls = count_key_calls(counts, key)
+        total_replacements += key_total
+        log.append(f"    - {key.decode()}: {key_calls}")
+    log.append(f"  [+] Patch 19/19: Remaining localStorage keys prefixed ({total_replacements} occurrences)")
+    log.append("[+] All 19 patches applied successfully!\n")
+    sys.stdout.write('\n'.join(log) + '\n')
+
+    return output
+
+def save_file(content, filename):
+    """Saves the patched file"""
+    print(f"[*] Saving file: {filename}")
+    try:
+        write_file_atomic(filename, content)
+        print(f"[+] File saved successfully!")
+    except Exception as e:
+        print(f"[!] Error saving file: {e}")
+        sys.exit(1)
+
+def parse_args():
+    """Parses the command line options"""
+    parser = argparse.ArgumentParser(description="Adapts OGLight for OGame Ninja")
+    parser.add_argument(
+        '--input', '--offline', metavar='PATH',
+        help="patch a local OGLight.user.js instead of downloading it",
+    )
+    parser.add_argument(
+        '--no-verify', action='store_true',
+        help="skip the SHA256 check (patch targets are still verified)",
+    )
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+
+    print("=" * 60)
+    print("OGLight Patcher - OGame Ninja Edition v2.9")
+    print("Supported OGLight version: 5.3.3 (19 patches)")
+    print("=" * 60)
+    print()
+
+    # 1. Download file (or read the local copy)
+    if args.input:
+        content, actual_sha = read_file(args.input)
+    else:
+        content, actual_sha = download_file(WEBSTORE_URL)
+
+    # 2. Validate SHA256
+    if args.no_verify:
+        print(f"[!] SHA256 check skipped (--no-verify), current SHA256: {actual_sha}")
+    else:
+        validate_sha256(actual_sha, EXPECTED_SHA256)
+
+    # 3. Apply patches
+    patched_content = apply_patches(content)
+
+    # 4. Save file
+    save_file(patched_content, OUTPUT_FILE)
+
+    print()
+    print("=" * 60)
+    print("Process completed successfully!")
+    print(f"Generated file: {OUTPUT_FILE}")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()